@@ -1,10 +1,15 @@
 import rumps
-from bambu_status import get_bambu_printer_status
-import time
+from PyObjCTools import AppHelper
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 import os
+import time
 import json
 import logging
-import subprocess # Import subprocess
+
+if TYPE_CHECKING:
+    # bambu_status pulls in paho/ssl; it's imported on the first status update instead
+    from bambu_status import BambuClient
 
 # --- Logging Configuration ---
 logging.basicConfig(
@@ -12,6 +17,7 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
+log = logging.getLogger(__name__)
 # ---------------------------
 
 # --- Configuration ---
@@ -19,9 +25,29 @@ logging.basicConfig(
 DEFAULT_PRINTER_IP = ""
 DEFAULT_PRINTER_SERIAL = ""
 DEFAULT_PRINTER_ACCESS_CODE = ""
-UPDATE_INTERVAL_SECONDS = 60 # Check every 60 seconds
+# Schema of the state file: persisted attribute -> default
+_STATE_DEFAULTS = {
+    "printer_ip": DEFAULT_PRINTER_IP,
+    "printer_serial": DEFAULT_PRINTER_SERIAL,
+    "printer_access_code": DEFAULT_PRINTER_ACCESS_CODE,
+}
+UPDATE_INTERVAL_SECONDS = 30 # Check every 30 seconds while printing
+IDLE_UPDATE_INTERVAL_SECONDS = 300 # Idle/finished printers rarely change
+FINAL_UPDATE_INTERVAL_SECONDS = 5 # Poll fast during the last minutes of a print
+FINAL_MINUTES = 2
+IDLE_STATES = ("IDLE", "FINISH", "FAILED")
+STATUS_TIMEOUT_SECONDS = 10 # Wait for the first report after connecting
+SAVE_DEBOUNCE_SECONDS = 1 # Coalesce settings changes made in quick succession
 # State file in user's home directory
 STATE_FILE = os.path.expanduser("~/.bambu_status_app_state.json")
+CONFIGURE_MENU_TITLE = "Configure Printer..."
+SINGLE_SETTINGS_MENU_TITLE = "Edit Single Setting" # Submenu holding the _FIELDS items
+# Menu title -> (attribute, prompt, dialog title) for each single-setting menu item
+_FIELDS = {
+    "Set IP Address...": ("printer_ip", "Enter Printer IP Address:", "Set IP Address"),
+    "Set Serial Number...": ("printer_serial", "Enter Printer Serial Number:", "Set Serial Number"),
+    "Set Access Code...": ("printer_access_code", "Enter Printer Access Code:", "Set Access Code"),
+}
 # ---------------------
 
 
@@ -29,269 +55,344 @@ class BambuStatusApp(rumps.App):
     def __init__(self):
         super(BambuStatusApp, self).__init__("3D Bambu", icon=None, quit_button=None)
         self.config_loaded = False
-        self.printer_ip = DEFAULT_PRINTER_IP
-        self.printer_serial = DEFAULT_PRINTER_SERIAL
-        self.printer_access_code = DEFAULT_PRINTER_ACCESS_CODE
-        # Create separate menu items for each setting
+        self._apply_state({}) # printer_ip, printer_serial, printer_access_code
+        # Persistent printer connection, created by the first fetch once configured.
+        # Only ever touched on the worker thread.
+        self.bambu = None
+        self._format_print_status = None # bambu_status.format_print_status, imported with the client
+        # Single worker for anything that may block on the printer connection
+        self._exec = ThreadPoolExecutor(max_workers=1)
+        self._pending = None # Future of the in-flight status fetch
+        self._last_title_tuple = None # (emoji, text) currently shown, None if title is something else
+        self._updating_config = False # True while a settings dialog is open
+        self._last_saved_state = None # Settings as last read from/written to STATE_FILE
+        self._save_due = None # Monotonic deadline of a pending save, None if nothing to write
+        # One dialog for all settings; per-setting items are tucked into a submenu
         self.menu = [
-            rumps.MenuItem("Set IP Address..."),
-            rumps.MenuItem("Set Serial Number..."),
-            rumps.MenuItem("Set Access Code..."),
+            rumps.MenuItem(CONFIGURE_MENU_TITLE),
+            (SINGLE_SETTINGS_MENU_TITLE, [rumps.MenuItem(menu_title) for menu_title in _FIELDS]),
             None,
-            rumps.MenuItem("Quit", callback=rumps.quit_application)
+            rumps.MenuItem("Quit", callback=self.quit_app)
         ]
         self.title = "3D ❓ Login needed" # Default title
         # Create timer manually
         self.status_timer = rumps.Timer(self.update_status, UPDATE_INTERVAL_SECONDS)
-        logging.info("App initializing...")
+        self.save_timer = rumps.Timer(self._flush_save, SAVE_DEBOUNCE_SECONDS)
+        log.info("App initializing...")
         self.load_settings() # Call load settings after initialization
 
     def _check_config_and_update(self):
         """Checks if all settings are present and updates config_loaded flag."""
         if self.printer_ip and self.printer_serial and self.printer_access_code:
             if not self.config_loaded:
-                logging.info("All settings present. Enabling status updates via timer.")
+                log.info("All settings present. Enabling status updates via timer.")
                 self.config_loaded = True
                 self.title = "3D Bambu: Ready"
-                self.status_timer.start() # Start timer when config is ready
-            # If already loaded, do nothing, timer should be running
+                self._last_title_tuple = None
+                self.status_timer.start() # Start timer when config is ready; its first tick creates the client
+            else: # Timer is already running; rebuild the connection if a credential changed
+                self._submit(
+                    self._sync_client, self.printer_ip, self.printer_serial, self.printer_access_code
+                )
         else:
             if self.config_loaded: # Log only if state changes to not configured
-                logging.info("Settings incomplete. Disabling status updates.")
+                log.info("Settings incomplete. Disabling status updates.")
                 self.status_timer.stop() # Stop timer if config becomes incomplete
+            self._close_client()
             self.config_loaded = False
             self.title = "3D ❓ Login needed"
 
+    def _close_client(self):
+        self._submit(self._drop_client) # close() joins paho's thread, keep it off the UI
+
+    def _sync_client(self, ip: str, serial: str, access_code: str) -> "BambuClient":
+        """Creates the client, or rebuilds it if a credential changed. Worker thread only."""
+        if self.bambu is None:
+            from bambu_status import BambuClient, format_print_status # Pulls in paho, so not on the main thread
+            self._format_print_status = format_print_status
+            self.bambu = BambuClient(ip, serial, access_code)
+            return self.bambu
+        try:
+            self.bambu.reconfigure(ip, serial, access_code)
+        except Exception:
+            self.bambu = None # Half torn down; rebuild from scratch next time
+            raise
+        return self.bambu
+
+    def _drop_client(self):
+        bambu, self.bambu = self.bambu, None
+        if bambu is not None:
+            bambu.close()
+
+    def _submit(self, fn, *args):
+        """Queues fn on the worker thread, logging any exception it raises."""
+        future = self._exec.submit(fn, *args)
+        future.add_done_callback(_log_worker_error)
+        return future
+
     def load_settings(self):
-        logging.info(f"Attempting to load settings from {STATE_FILE}")
+        log.info("Attempting to load settings from %s", STATE_FILE)
         try:
             if os.path.exists(STATE_FILE):
                 with open(STATE_FILE, 'r') as f:
                     loaded_state = json.load(f)
-                    logging.debug(f"Read state: {loaded_state}")
-                    ip = loaded_state.get("printer_ip")
-                    serial = loaded_state.get("printer_serial")
-                    code = loaded_state.get("printer_access_code")
-
-                    self.printer_ip = ip or DEFAULT_PRINTER_IP
-                    self.printer_serial = serial or DEFAULT_PRINTER_SERIAL
-                    self.printer_access_code = code or DEFAULT_PRINTER_ACCESS_CODE
+                    log.debug("Read state: %s", loaded_state)
+                    self._apply_state(loaded_state)
+                    self._last_saved_state = self._current_state()
 
                     # Check config status AFTER assigning values
                     self._check_config_and_update()
                     if self.config_loaded:
-                        logging.info(f"Loaded valid saved settings from {STATE_FILE}.")
+                        log.info("Loaded valid saved settings from %s.", STATE_FILE)
                         # Timer is started by _check_config_and_update
                     else:
-                         logging.info("Loaded settings file, but configuration is incomplete.")
+                         log.info("Loaded settings file, but configuration is incomplete.")
                     return # Exit load_settings
 
-            logging.info("No valid/complete saved settings found, requiring login.")
+            log.info("No valid/complete saved settings found, requiring login.")
             self._set_defaults_and_require_login()
 
-        except (FileNotFoundError, json.JSONDecodeError, Exception) as e:
-            logging.error(f"Error loading settings from {STATE_FILE}: {e}", exc_info=True)
+        except Exception as e: # Unreadable file, invalid JSON or not a JSON object
+            log.error("Error loading settings from %s: %s", STATE_FILE, e, exc_info=True)
             self._set_defaults_and_require_login()
 
     def _set_defaults_and_require_login(self):
-        self.printer_ip = DEFAULT_PRINTER_IP
-        self.printer_serial = DEFAULT_PRINTER_SERIAL
-        self.printer_access_code = DEFAULT_PRINTER_ACCESS_CODE
+        self._apply_state({})
         self.status_timer.stop() # Ensure timer is stopped
+        self._close_client()
         self.config_loaded = False
         self.title = "3D ❓ Login needed"
 
+    def _apply_state(self, state: dict):
+        """Sets every persisted attribute from state, falling back to its default."""
+        for key, default in _STATE_DEFAULTS.items():
+            setattr(self, key, state.get(key) or default)
+
+    def _current_state(self) -> dict:
+        return {key: getattr(self, key) for key in _STATE_DEFAULTS}
+
     def save_settings(self):
-        state_to_save = {
-            "printer_ip": self.printer_ip,
-            "printer_serial": self.printer_serial,
-            "printer_access_code": self.printer_access_code
-        }
-        logging.info(f"Attempting to save settings to {STATE_FILE}")
+        state_to_save = self._current_state()
+        if state_to_save == self._last_saved_state:
+            log.info("Settings unchanged, skipping save.")
+            return
+        log.info("Attempting to save settings to %s", STATE_FILE)
         try:
             with open(STATE_FILE, 'w') as f:
-                json.dump(state_to_save, f, indent=4)
-            logging.info(f"Settings saved successfully.")
+                json.dump(state_to_save, f, separators=(",", ":")) # Compact, no indentation
+            self._last_saved_state = state_to_save
+            log.info("Settings saved successfully.")
         except IOError as e:
-            logging.error(f"Error saving settings to {STATE_FILE}: {e}", exc_info=True)
+            log.error("Error saving settings to %s: %s", STATE_FILE, e, exc_info=True)
             rumps.alert(title="Save Error", message=f"Could not save settings.\n{e}")
 
-    def _run_applescript_input(self, prompt: str, title: str, default_answer: str) -> str | None:
-        """Uses AppleScript to prompt user for input. Returns input or None if cancelled/error."""
-        script = f'''
-tell app "System Events"
-    activate
-    try
-        display dialog "{prompt}" default answer "{default_answer}" with title "{title}" buttons {{"Cancel", "OK"}} default button "OK"
-        set theResponse to text returned of the result
-    on error number -128 # User cancelled
-        return "__CANCEL__"
-    end try
-end tell
-return theResponse
-'''
-        logging.info(f"Running AppleScript prompt: {title}")
-        try:
-            process = subprocess.run(
-                ["osascript", "-e", script],
-                capture_output=True,
-                text=True,
-                check=False # Don't raise exception on non-zero exit (e.g., cancel)
-            )
-            logging.info(f"AppleScript finished. Return code: {process.returncode}")
-
-            if process.returncode == 0:
-                user_input = process.stdout.strip()
-                logging.info(f"AppleScript returned input: '{user_input[:20]}...'") # Log truncated input
-                return user_input
-            elif "__CANCEL__" in process.stderr: # Check stderr for our cancel signal
-                logging.info("User cancelled AppleScript dialog.")
-                return None
-            else:
-                logging.error(f"AppleScript error. stderr: {process.stderr.strip()}")
-                rumps.alert(title="AppleScript Error", message="Could not get input.")
-                return None
-
-        except FileNotFoundError:
-            logging.error("'osascript' command not found. Is AppleScript installed?")
-            rumps.alert(title="Error", message="Cannot find 'osascript' command.")
-            return None
-        except Exception as e:
-            logging.error(f"Error running AppleScript: {e}", exc_info=True)
-            rumps.alert(title="Error", message="An unexpected error occurred while getting input.")
-            return None
-
-    @rumps.clicked("Set IP Address...")
-    def set_ip_address(self, _):
-        logging.info("'Set IP Address...' clicked.")
-        self.status_timer.stop() # Stop timer before showing dialog
-        logging.info("Status timer stopped for IP input.")
-        new_val = None
-        try:
-            new_val = self._run_applescript_input(
-                prompt="Enter Printer IP Address:",
-                title="Set IP Address",
-                default_answer=self.printer_ip
-            )
+    def _schedule_save(self):
+        """Saves settings once SAVE_DEBOUNCE_SECONDS pass without further changes."""
+        self._save_due = time.monotonic() + SAVE_DEBOUNCE_SECONDS
+        if not self.save_timer.is_alive():
+            self.save_timer.start()
 
-            if new_val is not None: # Proceed only if user didn't cancel
-                if new_val: # Check if input is not empty
-                    self.printer_ip = new_val
-                    logging.info("IP Address updated.")
-                    self.save_settings()
-                    self._check_config_and_update() # Check config
-                else:
-                    logging.warning("IP Address input was empty.")
-                    rumps.alert(title="Input Error", message="IP Address cannot be empty.")
-            # If new_val is None, user cancelled, do nothing further
+    def _flush_save(self, _=None):
+        # rumps timers fire once on start(), so wait here until the deadline passes
+        if self._save_due is not None and time.monotonic() < self._save_due:
+            return
+        self.save_timer.stop()
+        if self._save_due is not None:
+            self._save_due = None
+            self.save_settings()
 
-        except Exception as e:
-             # Errors during AppleScript execution are caught in _run_applescript_input
-             # This catches potential errors in the processing logic *after* getting input
-             logging.error(f"Error processing IP Address input: {e}", exc_info=True)
-        finally:
-            # Restart timer ONLY if config is loaded
-            if self.config_loaded:
-                self.status_timer.start()
-                logging.info("Status timer restarted after IP input attempt.")
-            else:
-                 logging.info("Status timer remains stopped (config incomplete) after IP input attempt." )
+    def quit_app(self, _):
+        if self._save_due is not None:
+            self._save_due = 0 # Write pending settings before quitting
+            self._flush_save()
+        rumps.quit_application()
 
-    @rumps.clicked("Set Serial Number...")
-    def set_serial_number(self, _):
-        logging.info("'Set Serial Number...' clicked.")
-        self.status_timer.stop()
-        logging.info("Status timer stopped for Serial input.")
-        new_val = None
+    def _prompt_and_update(self, attr: str, prompt: str, title: str):
+        """Prompts for a single setting with a native dialog and saves it if changed."""
+        label = title.removeprefix("Set ") # e.g. "IP Address"
+        log.info("'%s...' clicked.", title)
+        changed = False
+        self._updating_config = True # update_status skips ticks while the dialog is open
         try:
-            new_val = self._run_applescript_input(
-                prompt="Enter Printer Serial Number:",
-                title="Set Serial Number",
-                default_answer=self.printer_serial
+            window = rumps.Window(
+                message=prompt,
+                title=title,
+                default_text=getattr(self, attr),
+                ok="OK",
+                cancel="Cancel",
+                dimensions=(200, 24)
             )
+            response = window.run()
 
-            if new_val is not None:
-                if new_val:
-                    self.printer_serial = new_val
-                    logging.info("Serial Number updated.")
-                    self.save_settings()
-                    self._check_config_and_update()
+            if response.clicked: # Proceed only if user didn't cancel
+                new_val = response.text.strip()
+                if new_val: # Check if input is not empty
+                    setattr(self, attr, new_val)
+                    log.info("%s updated.", label)
+                    self._schedule_save()
+                    changed = True
                 else:
-                    logging.warning("Serial Number input was empty.")
-                    rumps.alert(title="Input Error", message="Serial Number cannot be empty.")
+                    log.warning("%s input was empty.", label)
+                    rumps.alert(title="Input Error", message=f"{label} cannot be empty.")
+            else:
+                log.info("User cancelled %s dialog.", label)
 
         except Exception as e:
-             logging.error(f"Error processing Serial Number input: {e}", exc_info=True)
+             log.error("Error processing %s input: %s", label, e, exc_info=True)
         finally:
-            if self.config_loaded:
-                self.status_timer.start()
-                logging.info("Status timer restarted after Serial input attempt.")
-            else:
-                 logging.info("Status timer remains stopped (config incomplete) after Serial input attempt." )
+            self._updating_config = False
+        if changed:
+            self._check_config_and_update() # Check config once ticks are allowed again
 
-    @rumps.clicked("Set Access Code...")
-    def set_access_code(self, _):
-        logging.info("'Set Access Code...' clicked.")
-        self.status_timer.stop()
-        logging.info("Status timer stopped for Access Code input.")
-        new_val = None
+    @rumps.clicked(CONFIGURE_MENU_TITLE)
+    def configure_printer(self, _):
+        """Prompts for all settings in one dialog, saving and reconnecting once."""
+        log.info("'%s' clicked.", CONFIGURE_MENU_TITLE)
+        attrs = [attr for attr, _prompt, _title in _FIELDS.values()]
+        changed = False
+        self._updating_config = True # update_status skips ticks while the dialog is open
         try:
-            new_val = self._run_applescript_input(
-                prompt="Enter Printer Access Code:",
-                title="Set Access Code",
-                default_answer=self.printer_access_code
+            window = rumps.Window(
+                message="Enter Printer IP Address, Serial Number and Access Code, separated by spaces or commas:",
+                title="Configure Printer",
+                default_text="\n".join(getattr(self, attr) for attr in attrs),
+                ok="OK",
+                cancel="Cancel",
+                dimensions=(260, 60)
             )
+            response = window.run()
 
-            if new_val is not None:
-                if new_val:
-                    self.printer_access_code = new_val
-                    logging.info("Access Code updated.")
-                    self.save_settings()
-                    self._check_config_and_update()
+            if response.clicked: # Proceed only if user didn't cancel
+                # None of the values can contain whitespace, so any separator works
+                values = response.text.replace(",", " ").split()
+                if len(values) == len(attrs):
+                    for attr, value in zip(attrs, values):
+                        setattr(self, attr, value)
+                    log.info("Printer configuration updated.")
+                    self._schedule_save()
+                    changed = True
                 else:
-                    logging.warning("Access Code input was empty.")
-                    rumps.alert(title="Input Error", message="Access Code cannot be empty.")
+                    log.warning("Expected %s values, got %s.", len(attrs), len(values))
+                    rumps.alert(
+                        title="Input Error",
+                        message="Please enter the IP Address, Serial Number and Access Code."
+                    )
+            else:
+                log.info("User cancelled configuration dialog.")
 
         except Exception as e:
-             logging.error(f"Error processing Access Code input: {e}", exc_info=True)
+             log.error("Error processing configuration input: %s", e, exc_info=True)
         finally:
-            if self.config_loaded:
-                self.status_timer.start()
-                logging.info("Status timer restarted after Access Code input attempt.")
-            else:
-                 logging.info("Status timer remains stopped (config incomplete) after Access Code input attempt." )
+            self._updating_config = False
+        if changed:
+            self._check_config_and_update() # Check config once ticks are allowed again
+
+    def _next_interval(self, print_data: dict | None) -> int:
+        """Picks the polling interval from the printer's state."""
+        if not print_data:
+            return UPDATE_INTERVAL_SECONDS
+        gcode_state = print_data.get("gcode_state", "")
+        remaining_time = print_data.get("mc_remaining_time", -1)
+        if gcode_state in IDLE_STATES:
+            return IDLE_UPDATE_INTERVAL_SECONDS
+        if gcode_state == "RUNNING" and 0 <= remaining_time <= FINAL_MINUTES:
+            return FINAL_UPDATE_INTERVAL_SECONDS
+        return UPDATE_INTERVAL_SECONDS
+
+    def _reschedule(self, interval: int):
+        if self.status_timer.interval == interval:
+            return
+        log.info("Polling interval changed to %ss.", interval)
+        # Restarting fires the timer once right away; the next tick keeps the interval
+        self.status_timer.stop()
+        self.status_timer.interval = interval
+        self.status_timer.start()
 
     def update_status(self, _):
+        if self._updating_config:
+            return
         if not self.config_loaded:
              if self.title != "3D ❓ Login needed":
-                 logging.warning("update_status called but config not loaded.")
+                 log.warning("update_status called but config not loaded.")
              self.title = "3D ❓ Login needed"
              return
 
-        logging.info(f"Fetching status for {self.printer_ip}...")
+        if self._pending is not None and not self._pending.done():
+            log.debug("Previous status fetch still running, skipping tick.")
+            return
+
+        log.info("Reading cached status for %s...", self.printer_ip)
+        self._pending = self._submit(
+            self._fetch_status, self.printer_ip, self.printer_serial, self.printer_access_code
+        )
+
+    def _fetch_status(self, ip: str, serial: str, access_code: str):
+        """Runs on the worker thread and hands the result back to the main thread."""
         try:
-            status_str = get_bambu_printer_status(
-                self.printer_ip, self.printer_serial, self.printer_access_code, timeout=10
-            )
-            logging.debug(f"Raw status string received: {status_str}")
-            if status_str == "Done":
-                self.title = f"3D ✅ {status_str}"
-            elif status_str == "Unknown":
-                 self.title = f"3D ❓ {status_str}"
-            elif "minutes" in status_str or "h" in status_str:
-                 self.title = f"3D ⏳ {status_str}"
+            bambu = self._sync_client(ip, serial, access_code)
+            # Only blocks right after (re)connecting, while the first report is pending
+            print_data = bambu.snapshot(timeout=STATUS_TIMEOUT_SECONDS)
+        except Exception as e:
+            log.error("Error fetching status: %s", e, exc_info=True)
+            AppHelper.callAfter(self._apply_status, None, e)
+            return
+        AppHelper.callAfter(self._apply_status, print_data)
+
+    def _apply_status(self, print_data: dict | None, error: Exception | None = None):
+        """Updates the menubar title; must run on the main thread."""
+        if not self.config_loaded:
+            return # Settings changed while the fetch was running
+        if error is not None:
+            self.title = "3D Bambu: Error"
+            self._last_title_tuple = None
+            return
+        try:
+            new_title_tuple = self._format_print_status(print_data)
+            if new_title_tuple == self._last_title_tuple:
+                # Assigning the title makes AppKit redraw the status item
+                log.debug("Status unchanged: %s", self.title)
             else:
-                 self.title = f"3D ℹ️ {status_str}"
-            logging.info(f"Update successful: {self.title}")
+                self._last_title_tuple = new_title_tuple
+                emoji, status_str = new_title_tuple
+                self.title = f"3D {emoji} {status_str}"
+                log.info("Update successful: %s", self.title)
+            self._reschedule(self._next_interval(print_data))
 
         except Exception as e:
-            logging.error(f"Error updating status: {e}", exc_info=True)
+            log.error("Error updating status: %s", e, exc_info=True)
             self.title = "3D Bambu: Error"
+            self._last_title_tuple = None
+
+
+def _log_worker_error(future):
+    if not future.cancelled() and future.exception() is not None:
+        error = future.exception()
+        log.error("Error in background task: %s", error, exc_info=error)
+
+
+def _make_setter(menu_title: str, attr: str, prompt: str, title: str):
+    """Builds the click handler for one _FIELDS entry."""
+    @rumps.clicked(SINGLE_SETTINGS_MENU_TITLE, menu_title)
+    def setter(self, _):
+        self._prompt_and_update(attr, prompt, title)
+    return setter
+
+
+def _install_setters():
+    """Generates set_ip_address, set_serial_number and set_access_code."""
+    for menu_title, (attr, prompt, title) in _FIELDS.items():
+        name = title.lower().replace(" ", "_")
+        setter = _make_setter(menu_title, attr, prompt, title)
+        setter.__name__ = setter.__qualname__ = name
+        setattr(BambuStatusApp, name, setter)
+
+
+_install_setters()
 
 # Set the app name for saving state correctly BEFORE instantiation
 # BambuStatusApp.application_support = "BambuStatusMenuApp" # No longer needed for state
 
 if __name__ == "__main__":
-    logging.info("Starting Bambu Status Menu App...")
+    log.info("Starting Bambu Status Menu App...")
     app = BambuStatusApp()
     app.run() 
\ No newline at end of file
@@ -1,123 +1,197 @@
-import paho.mqtt.client as mqtt
-import ssl
 import json
+import os
+import ssl
 import time
-import uuid
 import threading
+from functools import lru_cache
 
-def get_bambu_printer_status(ip: str, serial: str, access_code: str, timeout: int = 10) -> str:
-    """
-    Connects to a Bambu Lab printer via MQTTs and retrieves its status,
-    returning a formatted string indicating the print progress.
+MQTT_PORT = 8883
+PUSHALL_INTERVAL_SECONDS = 30 # Ask for a full report if the printer has been quiet this long
+RECONNECT_MAX_DELAY_SECONDS = 120 # Upper bound for paho's exponential reconnect backoff
+STATUS_PAYLOAD = {"pushing": {"sequence_id": "0", "command": "pushall"}}
+_STATUS_PAYLOAD_BYTES = json.dumps(STATUS_PAYLOAD).encode("utf-8") # Encoded once, published many times
 
-    Args:
-        ip: The IP address of the printer.
-        serial: The serial number of the printer.
-        access_code: The access code for the printer.
-        timeout: Time in seconds to wait for a status message.
 
-    Returns:
-        A string: "Done", "X minutes remaining", or "Unknown".
+# Built once and shared by every client/reconnect. Bambu printers use self-signed certs.
+_TLS_CONTEXT = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+_TLS_CONTEXT.check_hostname = False
+_TLS_CONTEXT.verify_mode = ssl.CERT_NONE
+
+
+class BambuClient:
     """
-    client_id = f"bambu-status-checker-{uuid.uuid4()}"
-    mqtt_port = 8883
-    publish_topic = f"device/{serial}/request"
-    subscribe_topic = f"device/{serial}/report"
-    status_payload = {"pushing": {"sequence_id": "0", "command": "pushall"}}
-
-    status_data = None
-    message_received_event = threading.Event()
-    connection_error = None
-
-    def on_connect(client, userdata, flags, rc, properties=None):
-        nonlocal connection_error
+    Keeps a single MQTTs session open to a Bambu Lab printer.
+
+    The client connects once, stays subscribed to the printer's report topic
+    and caches the latest 'print' data, so reading the status never touches
+    the network. Reconnects are handled by paho's network thread.
+    """
+
+    def __init__(self, ip: str, serial: str, access_code: str):
+        self._client = None
+        self._connect(ip, serial, access_code)
+
+    def _connect(self, ip: str, serial: str, access_code: str):
+        self.ip = ip
+        self.serial = serial
+        self.access_code = access_code
+        self._publish_topic = f"device/{serial}/request"
+        self._subscribe_topic = f"device/{serial}/report"
+        # (merged 'print' data, monotonic time of the report), replaced as a whole
+        # by paho's thread so readers get a consistent pair without locking
+        self._latest = ({}, 0.0)
+        self._connected = False
+        self._received = threading.Event() # Set once a report has been cached
+        self._settled = threading.Event() # Set on the first report or connection failure
+        self._started = time.monotonic()
+
+        import paho.mqtt.client as mqtt # Deferred until the first connection
+        # Unique enough per printer: one client per process at a time
+        client_id = f"bambu-status-checker-{os.getpid()}-{int(time.monotonic() * 1000)}"
+        client = mqtt.Client(client_id=client_id, protocol=mqtt.MQTTv311)
+        client.on_connect = self._on_connect
+        client.on_message = self._on_message
+        client.on_disconnect = self._on_disconnect
+        client.on_connect_fail = self._on_connect_fail
+
+        client.tls_set_context(_TLS_CONTEXT)
+        client.tls_insecure_set(True) # Bambu printers often use self-signed certs
+        client.username_pw_set("bblp", password=access_code)
+        client.reconnect_delay_set(min_delay=1, max_delay=RECONNECT_MAX_DELAY_SECONDS)
+
+        # Set before connecting so callbacks from the network thread recognise it
+        self._client = client
+        client.connect_async(ip, MQTT_PORT, 60)
+        client.loop_start() # Retries the first connection and reconnects with backoff
+
+    def _on_connect(self, client, userdata, flags, rc, properties=None):
+        if client is not self._client:
+            return # Late callback from a client that was torn down
         if rc == 0:
-            # print("Connected to MQTT Broker!") # Silenced verbose output
-            client.subscribe(subscribe_topic)
-            client.publish(publish_topic, json.dumps(status_payload))
+            self._connected = True
+            client.subscribe(self._subscribe_topic)
+            client.publish(self._publish_topic, _STATUS_PAYLOAD_BYTES)
         else:
-            connection_error = f"Failed to connect, return code {rc}"
-            # print(connection_error) # Silenced verbose output
-            message_received_event.set() # Signal to stop waiting
-
-    def on_message(client, userdata, msg):
-        nonlocal status_data
-        # print(f"Received message on {msg.topic}") # Silenced verbose output
+            self._connected = False
+            self._settled.set() # Refused/unauthorized: stop waiting for a first report
+
+    def _on_message(self, client, userdata, msg):
+        if client is not self._client:
+            return
+        # Cheap byte scan first: skip decoding frames that can't hold a status report
+        if b'"print"' not in msg.payload:
+            return
         try:
-            payload = json.loads(msg.payload.decode("utf-8"))
-            # Check if it looks like a status message (often contains 'print')
-            if "print" in payload:
-                status_data = payload
-                # print("Status data received.") # Silenced verbose output
-                message_received_event.set()
-            # Ignore other message types like pushing echo
+            payload = json.loads(msg.payload) # json accepts UTF-8 bytes directly
+            # Status reports carry a 'print' object; ignore pushing echoes etc.
+            print_data = payload.get("print")
+            if isinstance(print_data, dict):
+                # Reports may only contain the fields that changed
+                self._latest = ({**self._latest[0], **print_data}, time.monotonic())
+                self._received.set()
+                self._settled.set()
         except json.JSONDecodeError:
             print("Failed to decode JSON message") # Keep critical errors visible
         except Exception as e:
             print(f"Error processing message: {e}") # Keep critical errors visible
 
+    def _on_disconnect(self, client, userdata, rc, properties=None):
+        if client is self._client:
+            self._connected = False
+
+    def _on_connect_fail(self, client, userdata):
+        if client is self._client:
+            self._connected = False
+            self._settled.set() # Signal to stop waiting
+
+    def snapshot(self, timeout: float = 0) -> dict | None:
+        """
+        Returns the latest cached 'print' data. The dict is shared, don't modify it.
+
+        Args:
+            timeout: Time in seconds after connecting to wait for the first report.
+
+        Returns:
+            The cached data, or None if disconnected or no report arrived yet.
+        """
+        remaining = self._started + timeout - time.monotonic()
+        self._settled.wait(timeout=max(remaining, 0))
+        if not self._received.is_set() or not self._connected:
+            return None
+        latest, last_msg = self._latest
+        client = self._client
+        if client is not None and time.monotonic() - last_msg > PUSHALL_INTERVAL_SECONDS:
+            client.publish(self._publish_topic, _STATUS_PAYLOAD_BYTES)
+        return latest
+
+    def reconfigure(self, ip: str, serial: str, access_code: str):
+        """Tears down and rebuilds the connection if any credential changed."""
+        if (ip, serial, access_code) == (self.ip, self.serial, self.access_code):
+            return
+        self.close()
+        self._connect(ip, serial, access_code)
+
+    def close(self):
+        client, self._client = self._client, None
+        self._connected = False
+        if client is not None:
+            client.disconnect()
+            client.loop_stop()
+
+
+_UNKNOWN_STATUS = ("❓", "Unknown")
+
+
+@lru_cache(maxsize=256)
+def _format_status(remaining_time: int, gcode_state: str) -> tuple[str, str]:
+    # Consecutive polls usually repeat the same (minutes, state) pair
+    if gcode_state in ["FINISH", "FAILED", "IDLE"] or (gcode_state == "RUNNING" and remaining_time == 0) :
+         return ("✅", "Done")
+    elif remaining_time > 0 and gcode_state == "RUNNING":
+        hours, minutes = divmod(remaining_time, 60)
+        if hours > 0:
+            return ("⏳", f"{hours}h {minutes}m")
+        else:
+            return ("⏳", f"{minutes} minutes")
+    else:
+        # Fallback for unexpected states or missing time while not finished
+        return _UNKNOWN_STATUS
 
-    def on_disconnect(client, userdata, rc, properties=None):
-        # print(f"Disconnected with result code {rc}") # Silenced verbose output
-        pass
 
-    def on_connect_fail(client, userdata):
-        nonlocal connection_error
-        connection_error = "MQTT connection failed."
-        # print(connection_error) # Silenced verbose output
-        message_received_event.set() # Signal to stop waiting
+def format_print_status(print_data: dict | None) -> tuple[str, str]:
+    """
+    Formats cached 'print' data from the printer into a status.
 
+    Returns:
+        An (emoji, text) tuple, text being "Done", "X minutes", "Xh Ym" or "Unknown".
+    """
+    if not print_data:
+        return _UNKNOWN_STATUS # Return "Unknown" if no data received
+    remaining_time = print_data.get("mc_remaining_time", -1) # In minutes
+    gcode_state = print_data.get("gcode_state", "")
+    return _format_status(remaining_time, gcode_state)
 
-    client = mqtt.Client(client_id=client_id, protocol=mqtt.MQTTv311)
-    client.on_connect = on_connect
-    client.on_message = on_message
-    client.on_disconnect = on_disconnect
-    client.on_connect_fail = on_connect_fail
 
+def get_bambu_printer_status(ip: str, serial: str, access_code: str, timeout: int = 10) -> str:
+    """
+    Connects to a Bambu Lab printer via MQTTs and retrieves its status,
+    returning a formatted string indicating the print progress.
 
-    client.tls_set(tls_version=ssl.PROTOCOL_TLS_CLIENT, cert_reqs=ssl.CERT_NONE)
-    client.tls_insecure_set(True) # Bambu printers often use self-signed certs
-    client.username_pw_set("bblp", password=access_code)
+    Args:
+        ip: The IP address of the printer.
+        serial: The serial number of the printer.
+        access_code: The access code for the printer.
+        timeout: Time in seconds to wait for a status message.
 
+    Returns:
+        A string: "Done", "X minutes remaining", or "Unknown".
+    """
+    client = BambuClient(ip, serial, access_code)
     try:
-        client.connect_async(ip, mqtt_port, 60)
-        client.loop_start()
-
-        # print(f"Waiting for status message for up to {timeout} seconds...") # Silenced verbose output
-        event_triggered = message_received_event.wait(timeout=timeout)
-
+        print_data = client.snapshot(timeout=timeout)
     finally: # Ensure cleanup happens
-        client.loop_stop()
-        client.disconnect()
-
-    if connection_error:
-         # print(f"Exiting due to connection error: {connection_error}") # Silenced verbose output
-         return "Unknown" # Return "Unknown" on connection error
-    elif not event_triggered:
-        # print("Timeout waiting for status message.") # Silenced verbose output
-        return "Unknown" # Return "Unknown" on timeout
-    elif status_data:
-        # print("Successfully retrieved status.") # Silenced verbose output
-        # Parse the status
-        print_data = status_data.get("print", {})
-        remaining_time = print_data.get("mc_remaining_time", -1) # In minutes
-        gcode_state = print_data.get("gcode_state", "")
-
-        if gcode_state in ["FINISH", "FAILED", "IDLE"] or (gcode_state == "RUNNING" and remaining_time == 0) :
-             return "Done"
-        elif remaining_time > 0 and gcode_state == "RUNNING":
-            hours = remaining_time // 60
-            minutes = remaining_time % 60
-            if hours > 0:
-                return f"{hours}h {minutes}m"
-            else:
-                return f"{minutes} minutes"
-        else:
-            # Fallback for unexpected states or missing time while not finished
-            return "Unknown"
-    else:
-         # print("No status data received, though connection seemed okay.") # Silenced verbose output
-         return "Unknown" # Return "Unknown" if no data received
+        client.close()
+    return format_print_status(print_data)[1]
 
 
 if __name__ == "__main__":